@@ -23,13 +23,108 @@ Examples:
 
 import argparse
 import json
+import os
 import re
-import shutil
+import string
 import sys
 from pathlib import Path
 from typing import Optional
 
 
+_HEX_DIGITS = frozenset(string.hexdigits)
+
+# Pre-compiled patterns (module level so repeated updater calls skip re's compile cache)
+
+# theme.h: any QColor line followed by "} colors;"
+_THEME_H_COLORS_END_RE = re.compile(r'QColor \w+;\s*///< [^\n]*\n(?=\s*\} colors;)')
+
+# theme.cpp: fromJson() / toJson() anchors (infoHeader preferred, text as fallback).
+# Plain strings are literal anchors located with str.find.
+_FROM_JSON_INFOHEADER_RE = re.compile(
+    r'(theme\.colors\.infoHeader = parseColor\(colors\.value\("infoHeader", "[^"]+"\)\);)')
+_FROM_JSON_TEXT_RE = re.compile(r'(theme\.colors\.text = parseColor\(colors\.value\("text", "[^"]+"\)\);)')
+_TO_JSON_INFOHEADER = '{"infoHeader", colorToHex(colors.infoHeader)}'
+_TO_JSON_TEXT = '{"text", colorToHex(colors.text)}'
+
+# theme_manager.cpp: constructor fallback, applyColorOverrides(), setColorOverride()
+_FALLBACK_INFOHEADER_RE = re.compile(r'(m_currentTheme\.colors\.infoHeader = QColor\("[^"]+"\);)')
+_FALLBACK_TEXT_RE = re.compile(r'(m_currentTheme\.colors\.text = QColor\("[^"]+"\);)')
+_OVERRIDE_INFOHEADER_RE = re.compile(
+    r'(\} else if \(key == "infoHeader"\) \{\n\s*m_currentTheme\.colors\.infoHeader = color;\n\s*\})')
+_OVERRIDE_TEXT_RE = re.compile(
+    r'(\} else if \(key == "text"\) \{\n\s*m_currentTheme\.colors\.text = color;\n\s*\})')
+_SET_OVERRIDE_INFOHEADER_RE = re.compile(
+    r'(\} else if \(key == "infoHeader" \|\| key == "colors\.infoHeader"\) \{\n'
+    r'\s*m_currentTheme\.colors\.infoHeader = color;\n\s*\})')
+_SET_OVERRIDE_TEXT_RE = re.compile(
+    r'(\} else if \(key == "text" \|\| key == "colors\.text"\) \{\n\s*m_currentTheme\.colors\.text = color;\n\s*\})')
+
+# settings_data.h
+_SETTINGS_MEMBER_RE = re.compile(r'(QColor infoHeaderColor;\s*///< [^\n]+)')
+# Matches the comparison in both requiresVisualRefresh() and operator!=
+_SETTINGS_COMPARE_RE = re.compile(r'(infoHeaderColor != other\.infoHeaderColor \|\|)')
+
+# settings_dialog.h / main_window.cpp
+_DIALOG_MEMBER_RE = re.compile(r'(ColorConfigWidget\* m_infoHeaderColorWidget;)')
+_MAIN_WINDOW_COLLECT_RE = re.compile(r'(settingsData\.infoHeaderColor = theme\.colors\.infoHeader;)')
+
+# settings_dialog.cpp
+_DIALOG_INIT_INFOHEADER = ', m_infoHeaderColorWidget(nullptr)'
+_DIALOG_INIT_BRIGHTTEXT = ', m_brightTextColorWidget(nullptr)'
+_DIALOG_CREATE_RE = re.compile(
+    r'(m_infoHeaderColorWidget = new ColorConfigWidget\(tr\("Info Header"\), uiColorsGroup\);\n'
+    r'\s*m_infoHeaderColorWidget->setToolTip\(tr\("[^"]+"\)\);\n'
+    r'\s*uiColorsLayout->addWidget\(m_infoHeaderColorWidget\);)')
+_DIALOG_POPULATE = 'm_infoHeaderColorWidget->setColor(settings.infoHeaderColor);'
+_DIALOG_COLLECT = 'settingsData.infoHeaderColor = m_infoHeaderColorWidget->color();'
+_DIALOG_DEFAULT_RE = re.compile(r'(std::string defaultInfoHeader = isDark \? "[^"]+" : "[^"]+";)')
+_DIALOG_WIDGET_SET = 'm_infoHeaderColorWidget->setColor(QColor(QString::fromStdString(defaultInfoHeader)));'
+
+# Text inserted into each target, rendered once per run by render_templates().
+# Fields: name, dark, light, desc, ui_desc, member, widget, label, tooltip, default_comment, default_var
+_TEMPLATES = {
+    # theme.h
+    'theme_h_member': "        QColor {name}; ///< {desc}\n",
+    # theme.cpp
+    'from_json': '\n        theme.colors.{name} = parseColor(colors.value("{name}", "{dark}"));',
+    'to_json': ',\n        {{"{name}", colorToHex(colors.{name})}}',
+    # theme_manager.cpp
+    'fallback': '\n    m_currentTheme.colors.{name} = QColor("{light}");',
+    'apply_override': (
+        ' else if (key == "{name}") {{\n'
+        '            m_currentTheme.colors.{name} = color;\n'
+        '        }}'
+    ),
+    'set_override': (
+        '\n    // Custom color: {name}\n'
+        '    else if (key == "{name}" || key == "colors.{name}") {{\n'
+        '        m_currentTheme.colors.{name} = color;\n'
+        '    }}'
+    ),
+    # settings_data.h
+    'settings_member': '\n    QColor {member};        ///< {ui_desc}',
+    'settings_compare': '\n               {member} != other.{member} ||',
+    # settings_dialog.h
+    'dialog_member': '\n    ColorConfigWidget* {widget};',
+    # main_window.cpp
+    'main_window_collect': '\n    settingsData.{member} = theme.colors.{name};',
+    # settings_dialog.cpp
+    'dialog_init': '\n    , {widget}(nullptr)',
+    'dialog_create': (
+        '\n\n    {widget} = new ColorConfigWidget(tr("{label}"), uiColorsGroup);\n'
+        '    {widget}->setToolTip(tr("{tooltip}"));\n'
+        '    uiColorsLayout->addWidget({widget});'
+    ),
+    'dialog_populate': '\n    {widget}->setColor(settings.{member});',
+    'dialog_collect': '\n    settingsData.{member} = {widget}->color();',
+    'dialog_default': (
+        '\n    // {default_comment}\n'
+        '    std::string {default_var} = isDark ? "{dark}" : "{light}";'
+    ),
+    'dialog_theme_switch': '\n    {widget}->setColor(QColor(QString::fromStdString({default_var})));',
+}
+
+
 def get_project_root() -> Path:
     """Get project root directory (parent of scripts/)."""
     script_dir = Path(__file__).resolve().parent
@@ -41,16 +136,14 @@ def validate_camel_case(name: str) -> bool:
     if not name:
         return False
     # Must start with lowercase letter, followed by alphanumeric
-    pattern = r'^[a-z][a-zA-Z0-9]*$'
-    return bool(re.match(pattern, name))
+    return name.isascii() and name.isalnum() and name[0].islower()
 
 
 def validate_hex_color(color: str) -> bool:
     """Validate hex color format (#RRGGBB or #RGB)."""
-    if not color:
+    if not color or color[0] != '#' or len(color) not in (4, 7):
         return False
-    pattern = r'^#([0-9a-fA-F]{6}|[0-9a-fA-F]{3})$'
-    return bool(re.match(pattern, color))
+    return all(c in _HEX_DIGITS for c in color[1:])
 
 
 def normalize_hex_color(color: str) -> str:
@@ -61,30 +154,81 @@ def normalize_hex_color(color: str) -> str:
     return color
 
 
-def create_backup(file_path: Path) -> Path:
-    """Create a backup of the file."""
-    backup_path = file_path.with_suffix(file_path.suffix + '.bak')
-    shutil.copy2(file_path, backup_path)
-    return backup_path
+def render_templates(color_name: str, dark_value: str, light_value: str,
+                     description: str = '', label: str = '') -> dict[str, str]:
+    """Render every entry of _TEMPLATES for one color."""
+    # Use provided label, or fall back to formatted color_name
+    display_label = label if label else color_name.replace('_', ' ').title()
+    fields = {
+        'name': color_name,
+        'dark': dark_value,
+        'light': light_value,
+        'desc': description if description else 'Custom color',
+        'ui_desc': description if description else 'Custom UI color',
+        'member': f"{color_name}Color",
+        'widget': f"m_{color_name}ColorWidget",
+        'label': display_label,
+        'tooltip': description if description else f"{display_label} color",
+        'default_comment': description if description else color_name,
+        'default_var': f"default{color_name[0].upper()}{color_name[1:]}",
+    }
+    return {key: template.format(**fields) for key, template in _TEMPLATES.items()}
+
 
+def atomic_write(path: Path, data: str) -> None:
+    """Write text via a temp file + os.replace so the target is never half-written."""
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    try:
+        tmp_path.write_text(data, encoding='utf-8')
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def anchor_end(content: str, *candidates) -> int:
+    """Return the offset just past the first candidate anchor found in content, or -1.
+
+    Candidates are tried in order (preferred anchor first); each is either a literal
+    string or a compiled pattern.
+    """
+    for anchor in candidates:
+        if isinstance(anchor, str):
+            index = content.find(anchor)
+            if index >= 0:
+                return index + len(anchor)
+        else:
+            match = anchor.search(content)
+            if match:
+                return match.end()
+    return -1
 
-def restore_from_backup(file_path: Path, backup_path: Path) -> None:
-    """Restore file from backup."""
-    if backup_path.exists():
-        shutil.copy2(backup_path, file_path)
 
+def append_to_match(text: str):
+    """Return a re replacement callable that keeps the match and appends text verbatim.
 
-def cleanup_backup(backup_path: Path) -> None:
-    """Remove backup file."""
-    if backup_path.exists():
-        backup_path.unlink()
+    Unlike a '\\1...' template string, user text (e.g. a description containing
+    backslashes) is never interpreted as escapes or group references.
+    """
+    return lambda match: match.group(0) + text
 
 
-def update_theme_json(file_path: Path, color_name: str, color_value: str) -> bool:
+def splice(content: str, insertions: list) -> str:
+    """Apply (offset, text) insertions to content in a single pass."""
+    parts = []
+    prev = 0
+    for offset, text in sorted(insertions, key=lambda item: item[0]):
+        parts.append(content[prev:offset])
+        parts.append(text)
+        prev = offset
+    parts.append(content[prev:])
+    return ''.join(parts)
+
+
+def update_theme_json(content: str, file_name: str, color_name: str, color_value: str) -> tuple[str, bool]:
     """Add color to theme JSON file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json.loads(content)
 
         # Add to colors section
         if 'colors' not in data:
@@ -92,350 +236,222 @@ def update_theme_json(file_path: Path, color_name: str, color_value: str) -> boo
 
         # Check if color already exists
         if color_name in data['colors']:
-            print(f"[WARN] Color '{color_name}' already exists in {file_path.name}")
-            return True
+            print(f"[WARN] Color '{color_name}' already exists in {file_name}")
+            return content, True
 
         # Add after "text" entry (last standard color)
         data['colors'][color_name] = color_value
 
-        # Write back with proper formatting
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-
-        return True
+        # Serialize with proper formatting
+        return json.dumps(data, indent=2), True
     except Exception as e:
-        print(f"[FAIL] Error updating {file_path.name}: {e}")
-        return False
+        print(f"[FAIL] Error updating {file_name}: {e}")
+        return content, False
 
 
-def update_theme_h(file_path: Path, color_name: str, description: str) -> bool:
+def update_theme_h(content: str, file_name: str, color_name: str, rendered: dict) -> tuple[str, bool]:
     """Add color to Theme struct in theme.h."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         # Check if color already exists
         if f'QColor {color_name};' in content:
-            print(f"[WARN] Color '{color_name}' already exists in {file_path.name}")
-            return True
+            print(f"[WARN] Color '{color_name}' already exists in {file_name}")
+            return content, True
 
         # Generic pattern: find ANY QColor line followed by "} colors;"
         # This works regardless of which color is currently last
-        pattern = r'(QColor \w+;\s*///< [^\n]*\n)(\s*\} colors;)'
-
-        # Create the new color line with proper indentation
-        comment = f"///< {description}" if description else "///< Custom color"
-        new_line = f"        QColor {color_name}; {comment}\n"
-
-        replacement = r'\1' + new_line + r'\2'
-
-        new_content, count = re.subn(pattern, replacement, content)
+        new_content, count = _THEME_H_COLORS_END_RE.subn(append_to_match(rendered['theme_h_member']), content)
 
         if count == 0:
-            print(f"[FAIL] Could not find insertion point in {file_path.name}")
-            return False
+            print(f"[FAIL] Could not find insertion point in {file_name}")
+            return content, False
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
-        return True
+        return new_content, True
     except Exception as e:
-        print(f"[FAIL] Error updating {file_path.name}: {e}")
-        return False
+        print(f"[FAIL] Error updating {file_name}: {e}")
+        return content, False
 
 
-def update_theme_cpp(file_path: Path, color_name: str, dark_value: str, light_value: str) -> bool:
+def update_theme_cpp(content: str, file_name: str, color_name: str, rendered: dict) -> tuple[str, bool]:
     """Add color parsing and serialization to theme.cpp."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         # Check if color already exists
         if f'colors.{color_name}' in content:
-            print(f"[WARN] Color '{color_name}' already exists in {file_path.name}")
-            return True
+            print(f"[WARN] Color '{color_name}' already exists in {file_name}")
+            return content, True
 
         # 1. Add to fromJson() - after infoHeader parsing (or text if infoHeader not present)
-        from_json_pattern = r'(theme\.colors\.infoHeader = parseColor\(colors\.value\("infoHeader", "[^"]+"\)\);)'
-        if not re.search(from_json_pattern, content):
-            from_json_pattern = r'(theme\.colors\.text = parseColor\(colors\.value\("text", "[^"]+"\)\);)'
-
-        new_from_json = (
-            f'\\1\n        theme.colors.{color_name} = parseColor('
-            f'colors.value("{color_name}", "{dark_value}"));'
-        )
-
-        new_content, count1 = re.subn(from_json_pattern, new_from_json, content)
+        from_json_end = anchor_end(content, _FROM_JSON_INFOHEADER_RE, _FROM_JSON_TEXT_RE)
 
         # 2. Add to toJson() - after infoHeader serialization (or text if not present)
-        to_json_pattern = r'(\{"infoHeader", colorToHex\(colors\.infoHeader\)\})'
-        if not re.search(to_json_pattern, content):
-            to_json_pattern = r'(\{"text", colorToHex\(colors\.text\)\})'
-
-        new_to_json = f'\\1,\n        {{"{color_name}", colorToHex(colors.{color_name})}}'
-
-        new_content, count2 = re.subn(to_json_pattern, new_to_json, new_content)
-
-        if count1 == 0 or count2 == 0:
-            print(f"[FAIL] Could not find insertion points in {file_path.name} (fromJson: {count1}, toJson: {count2})")
-            return False
+        to_json_end = anchor_end(content, _TO_JSON_INFOHEADER, _TO_JSON_TEXT)
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        if from_json_end < 0 or to_json_end < 0:
+            print(f"[FAIL] Could not find insertion points in {file_name} "
+                  f"(fromJson: {int(from_json_end >= 0)}, toJson: {int(to_json_end >= 0)})")
+            return content, False
 
-        return True
+        return splice(content, [
+            (from_json_end, rendered['from_json']),
+            (to_json_end, rendered['to_json']),
+        ]), True
     except Exception as e:
-        print(f"[FAIL] Error updating {file_path.name}: {e}")
-        return False
+        print(f"[FAIL] Error updating {file_name}: {e}")
+        return content, False
 
 
-def update_theme_manager_cpp(file_path: Path, color_name: str, dark_value: str, light_value: str) -> bool:
+def update_theme_manager_cpp(content: str, file_name: str, color_name: str, rendered: dict) -> tuple[str, bool]:
     """Add color handling to theme_manager.cpp."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         # Check if color already exists
         if f'colors.{color_name}' in content:
-            print(f"[WARN] Color '{color_name}' already exists in {file_path.name}")
-            return True
+            print(f"[WARN] Color '{color_name}' already exists in {file_name}")
+            return content, True
 
         success = True
+        insertions = []
 
         # 1. Add to constructor fallback (after infoHeader or text)
-        fallback_pattern = r'(m_currentTheme\.colors\.infoHeader = QColor\("[^"]+"\);)'
-        if not re.search(fallback_pattern, content):
-            fallback_pattern = r'(m_currentTheme\.colors\.text = QColor\("[^"]+"\);)'
-
-        new_fallback = f'\\1\n    m_currentTheme.colors.{color_name} = QColor("{light_value}");'
-
-        new_content, count1 = re.subn(fallback_pattern, new_fallback, content)
-        if count1 == 0:
-            print(f"[WARN] Could not add fallback in {file_path.name}")
+        fallback_end = anchor_end(content, _FALLBACK_INFOHEADER_RE, _FALLBACK_TEXT_RE)
+        if fallback_end < 0:
+            print(f"[WARN] Could not add fallback in {file_name}")
             success = False
+        else:
+            insertions.append((fallback_end, rendered['fallback']))
 
         # 2. Add to applyColorOverrides() - after infoHeader or text handling
-        override_pattern = r'(\} else if \(key == "infoHeader"\) \{\n\s*m_currentTheme\.colors\.infoHeader = color;\n\s*\})'
-        if not re.search(override_pattern, content):
-            override_pattern = r'(\} else if \(key == "text"\) \{\n\s*m_currentTheme\.colors\.text = color;\n\s*\})'
-
-        new_override = (
-            f'\\1 else if (key == "{color_name}") {{\n'
-            f'            m_currentTheme.colors.{color_name} = color;\n'
-            f'        }}'
-        )
-
-        new_content, count2 = re.subn(override_pattern, new_override, new_content)
-        if count2 == 0:
-            print(f"[WARN] Could not add applyColorOverrides handler in {file_path.name}")
+        override_end = anchor_end(content, _OVERRIDE_INFOHEADER_RE, _OVERRIDE_TEXT_RE)
+        if override_end < 0:
+            print(f"[WARN] Could not add applyColorOverrides handler in {file_name}")
+        else:
+            insertions.append((override_end, rendered['apply_override']))
 
         # 3. Add to setColorOverride() - after infoHeader or text handling
-        set_override_pattern = r'(\} else if \(key == "infoHeader" \|\| key == "colors\.infoHeader"\) \{\n\s*m_currentTheme\.colors\.infoHeader = color;\n\s*\})'
-        if not re.search(set_override_pattern, content):
-            set_override_pattern = r'(\} else if \(key == "text" \|\| key == "colors\.text"\) \{\n\s*m_currentTheme\.colors\.text = color;\n\s*\})'
-
-        new_set_override = (
-            f'\\1\n    // Custom color: {color_name}\n'
-            f'    else if (key == "{color_name}" || key == "colors.{color_name}") {{\n'
-            f'        m_currentTheme.colors.{color_name} = color;\n'
-            f'    }}'
-        )
-
-        new_content, count3 = re.subn(set_override_pattern, new_set_override, new_content)
-        if count3 == 0:
-            print(f"[WARN] Could not add setColorOverride handler in {file_path.name}")
+        set_override_end = anchor_end(content, _SET_OVERRIDE_INFOHEADER_RE, _SET_OVERRIDE_TEXT_RE)
+        if set_override_end < 0:
+            print(f"[WARN] Could not add setColorOverride handler in {file_name}")
             success = False
+        else:
+            insertions.append((set_override_end, rendered['set_override']))
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
-        return success
+        return splice(content, insertions), success
     except Exception as e:
-        print(f"[FAIL] Error updating {file_path.name}: {e}")
-        return False
+        print(f"[FAIL] Error updating {file_name}: {e}")
+        return content, False
 
 
-def update_settings_data_h(file_path: Path, color_name: str, description: str) -> bool:
+def update_settings_data_h(content: str, file_name: str, color_name: str, rendered: dict) -> tuple[str, bool]:
     """Add color to SettingsData struct (in UI Colors section)."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         # Check if color already exists
         member_name = f"{color_name}Color"
         if f'QColor {member_name};' in content:
-            print(f"[WARN] Color '{member_name}' already exists in {file_path.name}")
-            return True
+            print(f"[WARN] Color '{member_name}' already exists in {file_name}")
+            return content, True
 
         # Find insertion point after infoHeaderColor (UI Colors section)
-        pattern = r'(QColor infoHeaderColor;\s*///< [^\n]+)'
-
-        comment = f"///< {description}" if description else "///< Custom UI color"
-        new_line = f"\\1\n    QColor {member_name};        {comment}"
-
-        new_content, count = re.subn(pattern, new_line, content)
+        new_content, count = _SETTINGS_MEMBER_RE.subn(append_to_match(rendered['settings_member']), content)
 
         if count == 0:
-            print(f"[FAIL] Could not find insertion point in {file_path.name}")
-            return False
+            print(f"[FAIL] Could not find insertion point in {file_name}")
+            return content, False
 
-        # Also need to add to requiresVisualRefresh and operator!=
-        # Add to requiresVisualRefresh comparison - after infoHeaderColor
-        refresh_pattern = r'(infoHeaderColor != other\.infoHeaderColor \|\|)'
-        refresh_new = f'\\1\n               {member_name} != other.{member_name} ||'
-        new_content, _ = re.subn(refresh_pattern, refresh_new, new_content)
+        # Also need to add to requiresVisualRefresh and operator!= - after infoHeaderColor
+        # (one substitution covers both comparisons)
+        new_content = _SETTINGS_COMPARE_RE.sub(append_to_match(rendered['settings_compare']), new_content)
 
-        # Add to operator!= comparison - after infoHeaderColor
-        neq_pattern = r'(infoHeaderColor != other\.infoHeaderColor \|\|\n)'
-        neq_new = f'\\1               {member_name} != other.{member_name} ||\n'
-        new_content, _ = re.subn(neq_pattern, neq_new, new_content)
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
-        return True
+        return new_content, True
     except Exception as e:
-        print(f"[FAIL] Error updating {file_path.name}: {e}")
-        return False
+        print(f"[FAIL] Error updating {file_name}: {e}")
+        return content, False
 
 
-def update_settings_dialog_h(file_path: Path, color_name: str) -> bool:
+def update_settings_dialog_h(content: str, file_name: str, color_name: str, rendered: dict) -> tuple[str, bool]:
     """Add ColorConfigWidget member to settings_dialog.h (UI Colors section)."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         widget_name = f"m_{color_name}ColorWidget"
         if widget_name in content:
-            print(f"[WARN] Widget '{widget_name}' already exists in {file_path.name}")
-            return True
+            print(f"[WARN] Widget '{widget_name}' already exists in {file_name}")
+            return content, True
 
         # Find insertion point after m_infoHeaderColorWidget
-        pattern = r'(ColorConfigWidget\* m_infoHeaderColorWidget;)'
-
-        new_line = f"\\1\n    ColorConfigWidget* {widget_name};"
-
-        new_content, count = re.subn(pattern, new_line, content)
+        new_content, count = _DIALOG_MEMBER_RE.subn(append_to_match(rendered['dialog_member']), content)
 
         if count == 0:
-            print(f"[FAIL] Could not find insertion point in {file_path.name}")
-            return False
+            print(f"[FAIL] Could not find insertion point in {file_name}")
+            return content, False
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
-        return True
+        return new_content, True
     except Exception as e:
-        print(f"[FAIL] Error updating {file_path.name}: {e}")
-        return False
+        print(f"[FAIL] Error updating {file_name}: {e}")
+        return content, False
 
 
-def update_main_window_cpp(file_path: Path, color_name: str) -> bool:
+def update_main_window_cpp(content: str, file_name: str, color_name: str, rendered: dict) -> tuple[str, bool]:
     """Add color to collectCurrentSettings() in main_window.cpp."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         member_name = f"{color_name}Color"
 
         # Check if color already exists
         if f'settingsData.{member_name}' in content:
-            print(f"[WARN] Color '{member_name}' already exists in {file_path.name}")
-            return True
+            print(f"[WARN] Color '{member_name}' already exists in {file_name}")
+            return content, True
 
         # Find insertion point after infoHeaderColor (theme is already defined there)
-        pattern = r'(settingsData\.infoHeaderColor = theme\.colors\.infoHeader;)'
-
-        # Just add new line - theme is already defined
-        new_line = f'\\1\n    settingsData.{member_name} = theme.colors.{color_name};'
-
-        new_content, count = re.subn(pattern, new_line, content)
+        new_content, count = _MAIN_WINDOW_COLLECT_RE.subn(append_to_match(rendered['main_window_collect']), content)
 
         if count == 0:
-            print(f"[FAIL] Could not find insertion point in {file_path.name}")
-            return False
+            print(f"[FAIL] Could not find insertion point in {file_name}")
+            return content, False
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
-        return True
+        return new_content, True
     except Exception as e:
-        print(f"[FAIL] Error updating {file_path.name}: {e}")
-        return False
+        print(f"[FAIL] Error updating {file_name}: {e}")
+        return content, False
 
 
-def update_settings_dialog_cpp(file_path: Path, color_name: str, description: str,
-                               dark_value: str, light_value: str, label: str = '') -> bool:
+def update_settings_dialog_cpp(content: str, file_name: str, color_name: str, rendered: dict) -> tuple[str, bool]:
     """Add color widget to settings_dialog.cpp (in UI Colors group)."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         widget_name = f"m_{color_name}ColorWidget"
-        member_name = f"{color_name}Color"
 
         if widget_name in content:
-            print(f"[WARN] Widget '{widget_name}' already exists in {file_path.name}")
-            return True
-
-        # 1. Initialize in constructor - after m_infoHeaderColorWidget(nullptr) or m_brightTextColorWidget
-        init_pattern = r'(, m_infoHeaderColorWidget\(nullptr\))'
-        if not re.search(init_pattern, content):
-            init_pattern = r'(, m_brightTextColorWidget\(nullptr\))'
-        init_new = f"\\1\n    , {widget_name}(nullptr)"
-        new_content, count1 = re.subn(init_pattern, init_new, content)
-
-        # 2. Create widget in UI Colors group - after m_infoHeaderColorWidget
-        # Find pattern in uiColorsGroup (NOT iconColorsGroup!)
-        create_pattern = r'(m_infoHeaderColorWidget = new ColorConfigWidget\(tr\("Info Header"\), uiColorsGroup\);\n\s*m_infoHeaderColorWidget->setToolTip\(tr\("[^"]+"\)\);\n\s*uiColorsLayout->addWidget\(m_infoHeaderColorWidget\);)'
-
-        # Use provided label, or fall back to formatted color_name
-        display_label = label if label else color_name.replace('_', ' ').title()
-        tooltip = description if description else f"{display_label} color"
-
-        create_new = (
-            f'\\1\n\n    {widget_name} = new ColorConfigWidget(tr("{display_label}"), uiColorsGroup);\n'
-            f'    {widget_name}->setToolTip(tr("{tooltip}"));\n'
-            f'    uiColorsLayout->addWidget({widget_name});'
-        )
-
-        new_content, count2 = re.subn(create_pattern, create_new, new_content)
-
-        # 3. Populate from settings - after infoHeaderColor
-        populate_pattern = r'(m_infoHeaderColorWidget->setColor\(settings\.infoHeaderColor\);)'
-        populate_new = f"\\1\n    {widget_name}->setColor(settings.{member_name});"
-        new_content, count3 = re.subn(populate_pattern, populate_new, new_content)
-
-        # 4. Collect to settings - after infoHeaderColor
-        collect_pattern = r'(settingsData\.infoHeaderColor = m_infoHeaderColorWidget->color\(\);)'
-        collect_new = f"\\1\n    settingsData.{member_name} = {widget_name}->color();"
-        new_content, count4 = re.subn(collect_pattern, collect_new, new_content)
-
-        # 5. Add default value in onThemeComboChanged() - after defaultInfoHeader
-        default_pattern = r'(std::string defaultInfoHeader = isDark \? "[^"]+" : "[^"]+";)'
-
-        default_var = f"default{color_name[0].upper()}{color_name[1:]}"
-        default_new = f"\\1\n    // {description if description else color_name}\n    std::string {default_var} = isDark ? \"{dark_value}\" : \"{light_value}\";"
-        new_content, count5 = re.subn(default_pattern, default_new, new_content)
-
-        # 6. Add widget color setting in onThemeComboChanged() - after infoHeader widget
-        widget_set_pattern = r'(m_infoHeaderColorWidget->setColor\(QColor\(QString::fromStdString\(defaultInfoHeader\)\)\);)'
-
-        widget_set_new = f"\\1\n    {widget_name}->setColor(QColor(QString::fromStdString({default_var})));"
-        new_content, count6 = re.subn(widget_set_pattern, widget_set_new, new_content)
-
-        if count1 == 0 or count2 == 0:
-            print(f"[WARN] Some insertions failed in {file_path.name} "
-                  f"(init: {count1}, create: {count2}, populate: {count3}, collect: {count4}, "
-                  f"default: {count5}, themeSwitch: {count6})")
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
-        return count1 > 0 and count2 > 0
+            print(f"[WARN] Widget '{widget_name}' already exists in {file_name}")
+            return content, True
+
+        # (candidate anchors, text inserted after the first one found); all offsets are
+        # located in the original content and spliced in one pass
+        anchors = {
+            # 1. Initialize in constructor - after m_infoHeaderColorWidget(nullptr) or m_brightTextColorWidget
+            'init': ((_DIALOG_INIT_INFOHEADER, _DIALOG_INIT_BRIGHTTEXT), rendered['dialog_init']),
+            # 2. Create widget in UI Colors group - after m_infoHeaderColorWidget
+            #    (anchor is in uiColorsGroup, NOT iconColorsGroup!)
+            'create': ((_DIALOG_CREATE_RE,), rendered['dialog_create']),
+            # 3. Populate from settings - after infoHeaderColor
+            'populate': ((_DIALOG_POPULATE,), rendered['dialog_populate']),
+            # 4. Collect to settings - after infoHeaderColor
+            'collect': ((_DIALOG_COLLECT,), rendered['dialog_collect']),
+            # 5. Add default value in onThemeComboChanged() - after defaultInfoHeader
+            'default': ((_DIALOG_DEFAULT_RE,), rendered['dialog_default']),
+            # 6. Add widget color setting in onThemeComboChanged() - after infoHeader widget
+            'themeSwitch': ((_DIALOG_WIDGET_SET,), rendered['dialog_theme_switch']),
+        }
+
+        insertions = []
+        counts = {}
+        for key, (candidates, text) in anchors.items():
+            offset = anchor_end(content, *candidates)
+            counts[key] = 1 if offset >= 0 else 0
+            if offset >= 0:
+                insertions.append((offset, text))
+
+        if counts['init'] == 0 or counts['create'] == 0:
+            print(f"[WARN] Some insertions failed in {file_name} "
+                  f"({', '.join(f'{key}: {count}' for key, count in counts.items())})")
+
+        return splice(content, insertions), counts['init'] > 0 and counts['create'] > 0
     except Exception as e:
-        print(f"[FAIL] Error updating {file_path.name}: {e}")
-        return False
+        print(f"[FAIL] Error updating {file_name}: {e}")
+        return content, False
 
 
 def main():
@@ -497,123 +513,75 @@ def main():
             print(f"[FAIL] File not found: {path}")
             sys.exit(1)
 
-    print(f"Adding color '{args.color_name}' to theme system...")
-    print(f"  Dark theme:  {dark_value}")
-    print(f"  Light theme: {light_value}")
+    header = [
+        f"Adding color '{args.color_name}' to theme system...",
+        f"  Dark theme:  {dark_value}",
+        f"  Light theme: {light_value}",
+    ]
     if args.description:
-        print(f"  Description: {args.description}")
-    print()
+        header.append(f"  Description: {args.description}")
+    sys.stdout.write('\n'.join(header) + '\n\n')
 
-    # Create backups
-    backups = {}
-    for name, path in files.items():
-        backups[name] = create_backup(path)
-
-    # Track success
-    success_count = 0
-    total_count = 0
-    results = {}
+    # Read every target once; originals double as the in-memory rollback snapshot
+    originals = {name: path.read_text(encoding='utf-8') for name, path in files.items()}
+    contents = dict(originals)
 
-    try:
-        # Update theme JSON files
-        total_count += 1
-        if update_theme_json(files['dark_json'], args.color_name, dark_value):
-            print(f"[OK] Updated {files['dark_json'].relative_to(project_root)}")
-            success_count += 1
-            results['dark_json'] = True
-        else:
-            results['dark_json'] = False
-
-        total_count += 1
-        if update_theme_json(files['light_json'], args.color_name, light_value):
-            print(f"[OK] Updated {files['light_json'].relative_to(project_root)}")
-            success_count += 1
-            results['light_json'] = True
-        else:
-            results['light_json'] = False
-
-        # Update theme.h
-        total_count += 1
-        if update_theme_h(files['theme_h'], args.color_name, args.description):
-            print(f"[OK] Updated {files['theme_h'].relative_to(project_root)}")
-            success_count += 1
-            results['theme_h'] = True
-        else:
-            results['theme_h'] = False
+    # Render all inserted C++ snippets once
+    rendered = render_templates(args.color_name, dark_value, light_value, args.description, args.label)
 
-        # Update theme.cpp
-        total_count += 1
-        if update_theme_cpp(files['theme_cpp'], args.color_name, dark_value, light_value):
-            print(f"[OK] Updated {files['theme_cpp'].relative_to(project_root)}")
-            success_count += 1
-            results['theme_cpp'] = True
-        else:
-            results['theme_cpp'] = False
+    updates = [
+        ('dark_json', update_theme_json, (args.color_name, dark_value)),
+        ('light_json', update_theme_json, (args.color_name, light_value)),
+        ('theme_h', update_theme_h, (args.color_name, rendered)),
+        ('theme_cpp', update_theme_cpp, (args.color_name, rendered)),
+        ('theme_manager_cpp', update_theme_manager_cpp, (args.color_name, rendered)),
+    ]
 
-        # Update theme_manager.cpp
-        total_count += 1
-        if update_theme_manager_cpp(files['theme_manager_cpp'], args.color_name, dark_value, light_value):
-            print(f"[OK] Updated {files['theme_manager_cpp'].relative_to(project_root)}")
+    # Update settings dialog files if requested
+    if args.add_to_settings:
+        updates += [
+            ('settings_data_h', update_settings_data_h, (args.color_name, rendered)),
+            ('settings_dialog_h', update_settings_dialog_h, (args.color_name, rendered)),
+            ('settings_dialog_cpp', update_settings_dialog_cpp, (args.color_name, rendered)),
+            ('main_window_cpp', update_main_window_cpp, (args.color_name, rendered)),
+        ]
+
+    # Track success; per-file [OK] lines are reported together once everything is written
+    success_count = 0
+    total_count = len(updates)
+    report = []
+
+    for name, updater, updater_args in updates:
+        path = files[name]
+        contents[name], ok = updater(contents[name], path.name, *updater_args)
+        if ok:
+            report.append(f"[OK] Updated {path.relative_to(project_root)}")
             success_count += 1
-            results['theme_manager_cpp'] = True
-        else:
-            results['theme_manager_cpp'] = False
-
-        # Update settings dialog files if requested
-        if args.add_to_settings:
-            total_count += 1
-            if update_settings_data_h(files['settings_data_h'], args.color_name, args.description):
-                print(f"[OK] Updated {files['settings_data_h'].relative_to(project_root)}")
-                success_count += 1
-                results['settings_data_h'] = True
-            else:
-                results['settings_data_h'] = False
-
-            total_count += 1
-            if update_settings_dialog_h(files['settings_dialog_h'], args.color_name):
-                print(f"[OK] Updated {files['settings_dialog_h'].relative_to(project_root)}")
-                success_count += 1
-                results['settings_dialog_h'] = True
-            else:
-                results['settings_dialog_h'] = False
-
-            total_count += 1
-            if update_settings_dialog_cpp(files['settings_dialog_cpp'], args.color_name, args.description,
-                                          dark_value, light_value, args.label):
-                print(f"[OK] Updated {files['settings_dialog_cpp'].relative_to(project_root)}")
-                success_count += 1
-                results['settings_dialog_cpp'] = True
-            else:
-                results['settings_dialog_cpp'] = False
-
-            total_count += 1
-            if update_main_window_cpp(files['main_window_cpp'], args.color_name):
-                print(f"[OK] Updated {files['main_window_cpp'].relative_to(project_root)}")
-                success_count += 1
-                results['main_window_cpp'] = True
-            else:
-                results['main_window_cpp'] = False
-
-        # Final status
-        print()
-        if success_count == total_count:
-            print(f"Done! Added color '{args.color_name}' to {success_count} files.")
-            # Clean up backups on success
-            for backup_path in backups.values():
-                cleanup_backup(backup_path)
-        else:
-            print(f"Completed with warnings. Updated {success_count}/{total_count} files.")
-            print("Backup files (.bak) preserved for manual review.")
 
-    except Exception as e:
-        print(f"\n[FAIL] Unexpected error: {e}")
-        print("Restoring from backups...")
+    # Write back only the files that actually changed
+    written = []
+    try:
         for name, path in files.items():
-            if name in backups:
-                restore_from_backup(path, backups[name])
+            if contents[name] != originals[name]:
+                atomic_write(path, contents[name])
+                written.append(name)
+    except Exception as e:
+        print(f"\n[FAIL] Unexpected error: {e}", flush=True)
+        print("Restoring original file contents...")
+        for name in written:
+            atomic_write(files[name], originals[name])
         print("Files restored. Please check the error and try again.")
         sys.exit(1)
 
+    # Final status
+    report.append('')
+    if success_count == total_count:
+        report.append(f"Done! Added color '{args.color_name}' to {success_count} files.")
+    else:
+        report.append(f"Completed with warnings. Updated {success_count}/{total_count} files.")
+        report.append("Review the warnings above before building.")
+    sys.stdout.write('\n'.join(report) + '\n')
+
 
 if __name__ == '__main__':
     main()
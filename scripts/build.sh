@@ -74,6 +74,8 @@ Options:
   --clean, -c       Clean build directory before building
   --test, -t        Run tests after building
   --verbose, -v     Enable verbose build output
+  --jobs, -j N      Number of parallel build jobs (default: all CPU cores)
+  --target NAME     Build only the given CMake target (repeatable)
   --help, -h        Show this help message
 
 Platform-Specific Options:
@@ -30,6 +30,8 @@ BUILD_TYPE="Debug"
 CLEAN_BUILD=false
 RUN_TESTS=false
 VERBOSE=false
+JOBS=""        # empty = all CPU cores
+TARGETS=()     # empty = default (all) target
 FORCE_MODE=""  # empty, "vbox", "native"
 
 # =============================================================================
@@ -53,6 +55,8 @@ Options:
   --clean, -c         Clean build directory before building
   --test, -t          Run tests after building
   --verbose, -v       Enable verbose build output
+  --jobs, -j N        Number of parallel build jobs (default: all CPU cores)
+  --target NAME       Build only the given CMake target (repeatable)
   --force-vbox        Force shared filesystem workflow (rsync + local build)
   --force-native      Force native build (skip auto-detection)
   --help, -h          Show this help message
@@ -62,6 +66,7 @@ Examples:
   $0 --release            # Release build
   $0 --clean --release    # Clean + Release build
   $0 --test               # Debug build + run tests
+  $0 --target kalahari    # Rebuild only the app target
   $0 --force-native       # Force native build (not recommended on shared fs)
 
 Shared Filesystem Support:
@@ -91,6 +96,16 @@ while [[ $# -gt 0 ]]; do
         --clean|-c) CLEAN_BUILD=true; shift ;;
         --test|-t) RUN_TESTS=true; shift ;;
         --verbose|-v) VERBOSE=true; shift ;;
+        --jobs|-j)
+            if [[ ! ${2:-} =~ ^[1-9][0-9]*$ ]]; then
+                print_error "$1 requires a positive number of jobs"; echo ""; show_help; exit 1
+            fi
+            JOBS="$2"; shift 2 ;;
+        --target)
+            if [[ -z ${2:-} || $2 == -* ]]; then
+                print_error "--target requires a target name"; echo ""; show_help; exit 1
+            fi
+            TARGETS+=("$2"); shift 2 ;;
         --force-vbox) FORCE_MODE="vbox"; shift ;;
         --force-native) FORCE_MODE="native"; shift ;;
         --help|-h) show_help; exit 0 ;;
@@ -522,6 +537,24 @@ if [ "$VERBOSE" = true ]; then
     CMAKE_ARGS+=(-DCMAKE_VERBOSE_MAKEFILE=ON)
 fi
 
+# Use a compiler cache if available (sccache preferred, then ccache)
+COMPILER_LAUNCHER=$(command -v sccache || command -v ccache || true)
+if [ -n "$COMPILER_LAUNCHER" ]; then
+    print_info "Using compiler cache: $COMPILER_LAUNCHER"
+    CMAKE_ARGS+=(
+        -DCMAKE_C_COMPILER_LAUNCHER="$COMPILER_LAUNCHER"
+        -DCMAKE_CXX_COMPILER_LAUNCHER="$COMPILER_LAUNCHER"
+    )
+    # kalahari_core/kalahari use precompiled headers; ccache refuses to cache
+    # PCH compilations unless these differences are declared harmless
+    if [ "$(basename "$COMPILER_LAUNCHER")" = "ccache" ]; then
+        export CCACHE_SLOPPINESS="${CCACHE_SLOPPINESS:+$CCACHE_SLOPPINESS,}pch_defines,time_macros,include_file_mtime,include_file_ctime"
+    fi
+else
+    # Drop a launcher cached by an earlier configure (the tool may have been removed since)
+    CMAKE_ARGS+=(-UCMAKE_C_COMPILER_LAUNCHER -UCMAKE_CXX_COMPILER_LAUNCHER)
+fi
+
 # Force system binaries for VirtualBox (avoids cmake download issues)
 export VCPKG_FORCE_SYSTEM_BINARIES=1
 
@@ -560,9 +593,14 @@ if [ "$VERBOSE" = true ]; then
     BUILD_ARGS+=(--verbose)
 fi
 
-NUM_CORES=$(nproc 2>/dev/null || echo 4)
+NUM_CORES=${JOBS:-$(nproc 2>/dev/null || echo 4)}
 BUILD_ARGS+=(--parallel "$NUM_CORES")
 
+if [ ${#TARGETS[@]} -gt 0 ]; then
+    print_info "Building target(s): ${TARGETS[*]}"
+    BUILD_ARGS+=(--target "${TARGETS[@]}")
+fi
+
 if ! cmake "${BUILD_ARGS[@]}"; then
     print_error "Build failed"
     exit 1
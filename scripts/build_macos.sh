@@ -34,6 +34,8 @@ CLEAN_BUILD=false
 RUN_TESTS=false
 VERBOSE=false
 UNIVERSAL_BINARY=false
+JOBS=""  # empty = all CPU cores
+TARGETS=()  # empty = default (all) target
 
 # Detect architecture
 ARCH="$(uname -m)"
@@ -72,6 +74,8 @@ Options:
   --test, -t         Run tests after building
   --universal, -u    Build Universal Binary (Intel + Apple Silicon)
   --verbose, -v      Enable verbose build-macos output
+  --jobs, -j N       Number of parallel build jobs (default: all CPU cores)
+  --target NAME      Build only the given CMake target (repeatable)
   --help, -h         Show this help message
 
 Examples:
@@ -81,6 +85,7 @@ Examples:
   $0 --clean --release     # Clean + Release build-macos
   $0 --test                # Debug build-macos + run tests
   $0 -r -u -t              # Release universal binary + tests
+  $0 --target kalahari     # Rebuild only the app target
 
 Architecture Info:
   Current:   $ARCH
@@ -121,6 +126,26 @@ parse_arguments() {
                 VERBOSE=true
                 shift
                 ;;
+            --jobs|-j)
+                if [[ ! ${2:-} =~ ^[1-9][0-9]*$ ]]; then
+                    print_error "$1 requires a positive number of jobs"
+                    echo ""
+                    show_help
+                    exit 1
+                fi
+                JOBS="$2"
+                shift 2
+                ;;
+            --target)
+                if [[ -z ${2:-} || $2 == -* ]]; then
+                    print_error "--target requires a target name"
+                    echo ""
+                    show_help
+                    exit 1
+                fi
+                TARGETS+=("$2")
+                shift 2
+                ;;
             --help|-h)
                 show_help
                 exit 0
@@ -292,6 +317,24 @@ configure_cmake() {
         CMAKE_ARGS+=(-DCMAKE_VERBOSE_MAKEFILE=ON)
     fi
 
+    # Use a compiler cache if available (sccache preferred, then ccache)
+    COMPILER_LAUNCHER=$(command -v sccache || command -v ccache || true)
+    if [ -n "$COMPILER_LAUNCHER" ]; then
+        print_info "Using compiler cache: $COMPILER_LAUNCHER"
+        CMAKE_ARGS+=(
+            -DCMAKE_C_COMPILER_LAUNCHER="$COMPILER_LAUNCHER"
+            -DCMAKE_CXX_COMPILER_LAUNCHER="$COMPILER_LAUNCHER"
+        )
+        # kalahari_core/kalahari use precompiled headers; ccache refuses to cache
+        # PCH compilations unless these differences are declared harmless
+        if [ "$(basename "$COMPILER_LAUNCHER")" = "ccache" ]; then
+            export CCACHE_SLOPPINESS="${CCACHE_SLOPPINESS:+$CCACHE_SLOPPINESS,}pch_defines,time_macros,include_file_mtime,include_file_ctime"
+        fi
+    else
+        # Drop a launcher cached by an earlier configure (the tool may have been removed since)
+        CMAKE_ARGS+=(-UCMAKE_C_COMPILER_LAUNCHER -UCMAKE_CXX_COMPILER_LAUNCHER)
+    fi
+
     # Ensure vcpkg can find ninja (for sub-builds like Python3, OpenSSL)
     if command -v ninja &> /dev/null; then
         export CMAKE_MAKE_PROGRAM=$(command -v ninja)
@@ -321,7 +364,7 @@ build_project() {
     START_TIME=$(date +%s)
 
     BUILD_ARGS=(
-        --build-macos build-macos
+        --build build-macos
         --config "$BUILD_TYPE"
     )
 
@@ -330,9 +373,14 @@ build_project() {
     fi
 
     # Get number of CPU cores for parallel build-macos
-    NUM_CORES=$(sysctl -n hw.ncpu 2>/dev/null || echo 4)
+    NUM_CORES=${JOBS:-$(sysctl -n hw.ncpu 2>/dev/null || echo 4)}
     BUILD_ARGS+=(--parallel "$NUM_CORES")
 
+    if [ ${#TARGETS[@]} -gt 0 ]; then
+        print_info "Building target(s): ${TARGETS[*]}"
+        BUILD_ARGS+=(--target "${TARGETS[@]}")
+    fi
+
     if ! cmake "${BUILD_ARGS[@]}"; then
         print_error "Build failed"
         exit 1
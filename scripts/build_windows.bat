@@ -57,6 +57,21 @@ if defined VCINSTALLDIR (
 
 echo [INFO] Detecting Visual Studio installation...
 
+REM Prefer vswhere (installed with every VS 2017+ setup): a single query finds
+REM the newest install with C++ tools, including Build Tools and Preview editions
+set "VS_INSTALL="
+set "VSWHERE=%ProgramFiles(x86)%\Microsoft Visual Studio\Installer\vswhere.exe"
+if exist "%VSWHERE%" (
+    for /f "usebackq delims=" %%i in (`"%VSWHERE%" -latest -prerelease -products * -requires Microsoft.VisualStudio.Component.VC.Tools.x86.x64 -property installationPath`) do set "VS_INSTALL=%%i"
+)
+if defined VS_INSTALL if exist "%VS_INSTALL%\VC\Auxiliary\Build\vcvarsall.bat" (
+    set "VCVARSALL=%VS_INSTALL%\VC\Auxiliary\Build\vcvarsall.bat"
+    set "VS_VERSION=(detected via vswhere)"
+    for /f "usebackq delims=" %%i in (`"%VSWHERE%" -latest -prerelease -products * -requires Microsoft.VisualStudio.Component.VC.Tools.x86.x64 -property catalog_productLineVersion`) do set "VS_VERSION=%%i"
+    goto found_vs
+)
+
+REM Fallback: probe well-known install directories
 REM Try Visual Studio 2026 Preview (newest)
 set "VS_PATH=C:\Program Files\Microsoft Visual Studio\18"
 if exist "%VS_PATH%\Community\VC\Auxiliary\Build\vcvarsall.bat" (
@@ -14,6 +14,48 @@ import re
 from pathlib import Path
 
 
+# All shape elements that receive the placeholder, matched in a single pass.
+# \b keeps <line from also matching <linearGradient. Icons are processed as raw
+# bytes (they are ASCII), so every pattern and literal here is bytes.
+_SHAPE_TAG_RE = re.compile(rb'<(?:path|rect|circle|polygon|ellipse|line|polyline)\b[^>]*/?>')
+_FILL_RE = re.compile(rb'fill="([^"]*)"')
+
+
+def replace_path(match):
+    """Add or replace the fill of a single shape tag with {COLOR_PRIMARY}."""
+    # We need to add fill="{COLOR_PRIMARY}" to shapes that:
+    # 1. Don't have fill attribute at all
+    # 2. Have fill with a color (not "none")
+    path_tag = match.group(0)
+
+    # Skip if already has placeholder
+    if b'{COLOR_PRIMARY}' in path_tag or b'{COLOR_SECONDARY}' in path_tag:
+        return path_tag
+
+    # Check if has fill="none" - skip these
+    if b'fill="none"' in path_tag or b"fill='none'" in path_tag:
+        return path_tag
+
+    # Check if has fill attribute with a color
+    fill_match = _FILL_RE.search(path_tag)
+    if fill_match:
+        fill_value = fill_match.group(1)
+        if fill_value != b'none':
+            # Replace the fill value with placeholder (plain replace of the exact attribute found)
+            return path_tag.replace(fill_match.group(0), b'fill="{COLOR_PRIMARY}"', 1)
+        return path_tag
+
+    # No fill attribute - add one before the closing >
+    # Handle self-closing tags <path ... />
+    if path_tag.endswith(b'/>'):
+        return path_tag[:-2] + b' fill="{COLOR_PRIMARY}"/>'
+    # Handle opening tags <path ...>
+    elif path_tag.endswith(b'>'):
+        return path_tag[:-1] + b' fill="{COLOR_PRIMARY}">'
+
+    return path_tag
+
+
 def convert_svg_file(filepath: Path) -> bool:
     """
     Convert a single SVG file to use color placeholders.
@@ -25,53 +67,13 @@ def convert_svg_file(filepath: Path) -> bool:
         True if file was modified, False otherwise
     """
     try:
-        content = filepath.read_text(encoding='utf-8')
-        original = content
-
-        # Pattern to match path elements
-        # We need to add fill="{COLOR_PRIMARY}" to paths that:
-        # 1. Don't have fill attribute at all
-        # 2. Have fill with a color (not "none")
-
-        def replace_path(match):
-            path_tag = match.group(0)
-
-            # Skip if already has placeholder
-            if '{COLOR_PRIMARY}' in path_tag or '{COLOR_SECONDARY}' in path_tag:
-                return path_tag
-
-            # Check if has fill="none" - skip these
-            if 'fill="none"' in path_tag or "fill='none'" in path_tag:
-                return path_tag
-
-            # Check if has fill attribute with a color
-            fill_match = re.search(r'fill="([^"]*)"', path_tag)
-            if fill_match:
-                fill_value = fill_match.group(1)
-                if fill_value != 'none':
-                    # Replace the fill value with placeholder
-                    return re.sub(r'fill="[^"]*"', 'fill="{COLOR_PRIMARY}"', path_tag)
-                return path_tag
-
-            # No fill attribute - add one before the closing >
-            # Handle self-closing tags <path ... />
-            if path_tag.endswith('/>'):
-                return path_tag[:-2] + ' fill="{COLOR_PRIMARY}"/>'
-            # Handle opening tags <path ...>
-            elif path_tag.endswith('>'):
-                return path_tag[:-1] + ' fill="{COLOR_PRIMARY}">'
-
-            return path_tag
-
-        # Match <path ...> or <path ... />
-        content = re.sub(r'<path[^>]*/?>', replace_path, content)
-
-        # Also handle <rect>, <circle>, <polygon>, <ellipse> if present
-        for tag in ['rect', 'circle', 'polygon', 'ellipse', 'line', 'polyline']:
-            content = re.sub(rf'<{tag}[^>]*/?>', replace_path, content)
+        original = filepath.read_bytes()
+
+        # <path>, <rect>, <circle>, <polygon>, <ellipse>, <line>, <polyline>
+        content = _SHAPE_TAG_RE.sub(replace_path, original)
 
         if content != original:
-            filepath.write_text(content, encoding='utf-8')
+            filepath.write_bytes(content)
             return True
 
         return False
@@ -103,10 +105,13 @@ def main():
         modified = 0
         count = 0
 
-        for svg_file in theme_dir.glob('*.svg'):
-            count += 1
-            if convert_svg_file(svg_file):
-                modified += 1
+        with os.scandir(theme_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.svg') or not entry.is_file(follow_symlinks=False):
+                    continue
+                count += 1
+                if convert_svg_file(Path(entry.path)):
+                    modified += 1
 
         total_files += count
         total_modified += modified
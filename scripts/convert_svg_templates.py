@@ -26,6 +26,21 @@ from pathlib import Path
 ET.register_namespace('', 'http://www.w3.org/2000/svg')
 ET.register_namespace('xlink', 'http://www.w3.org/1999/xlink')
 
+# Leftover auto-generated namespace declarations (xmlns:ns0="...") to strip from output
+_NS_PREFIX_RE = re.compile(rb'\s+xmlns:ns\d+="[^"]*"')
+
+# Elements to process (including groups), keyed by tag as ElementTree reports it
+# (Clark notation for namespaced SVG, bare for namespace-less files) -> local name
+_SVG_NS = '{http://www.w3.org/2000/svg}'
+_PROCESSABLE_TAGS = {
+    prefix + name: name
+    for name in ('path', 'circle', 'rect', 'polygon', 'polyline', 'ellipse', 'line', 'g')
+    for prefix in (_SVG_NS, '')
+}
+
+# Shapes that get a fill even without path data
+_SHAPE_TAGS = frozenset(('circle', 'rect', 'polygon', 'polyline', 'ellipse', 'line'))
+
 
 def get_opacity(element):
     """Get opacity value from element, defaulting to 1.0."""
@@ -39,7 +54,7 @@ def get_opacity(element):
 
 def has_placeholder(svg_content):
     """Check if SVG already has color placeholders."""
-    return '{COLOR_PRIMARY}' in svg_content or '{COLOR_SECONDARY}' in svg_content
+    return b'{COLOR_PRIMARY}' in svg_content or b'{COLOR_SECONDARY}' in svg_content
 
 
 def convert_svg_to_template(svg_path):
@@ -50,13 +65,13 @@ def convert_svg_to_template(svg_path):
         tuple: (success: bool, message: str)
     """
     try:
-        # Read original content
-        with open(svg_path, 'r', encoding='utf-8') as f:
+        # Read original content (kept as UTF-8 bytes end to end - no decode/encode round-trip)
+        with open(svg_path, 'rb') as f:
             original_content = f.read()
 
         # Skip if already has placeholders AND no opacity to remove
         if has_placeholder(original_content):
-            if 'opacity=' not in original_content and 'fill-opacity=' not in original_content:
+            if b'opacity=' not in original_content and b'fill-opacity=' not in original_content:
                 return True, "Already converted (no opacity to remove)"
             # Has placeholders but still has opacity - need to remove it
 
@@ -66,17 +81,14 @@ def convert_svg_to_template(svg_path):
         except ET.ParseError as e:
             return False, f"XML parse error: {e}"
 
-        # Elements to process (including groups)
-        processable_tags = ['path', 'circle', 'rect', 'polygon', 'polyline', 'ellipse', 'line', 'g']
-
         # Track if we made any changes
         modified = False
 
         # Find and process all elements
         for elem in root.iter():
-            local_name = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
+            local_name = _PROCESSABLE_TAGS.get(elem.tag)
 
-            if local_name not in processable_tags:
+            if local_name is None:
                 continue
 
             # STEP 1: Read opacity BEFORE removing it
@@ -101,32 +113,43 @@ def convert_svg_to_template(svg_path):
                 continue
 
             # Replace or add fill attribute (only for drawable elements, not groups without fill)
-            if fill and fill != 'none' and not fill.startswith('{COLOR_'):
-                elem.set('fill', color_placeholder)
-                modified = True
-            elif not fill and local_name != 'g':
+            if fill:
+                if not fill.startswith('{COLOR_'):
+                    elem.set('fill', color_placeholder)
+                    modified = True
+            elif local_name != 'g':
                 # Add fill if element has path data or is a shape (but not empty groups)
-                if elem.get('d') or local_name in ['circle', 'rect', 'polygon', 'polyline', 'ellipse', 'line']:
+                if elem.get('d') or local_name in _SHAPE_TAGS:
                     elem.set('fill', color_placeholder)
                     modified = True
 
         if not modified:
             return True, "No changes needed"
 
-        # Convert back to string
-        output = ET.tostring(root, encoding='unicode')
+        # Convert back to UTF-8 bytes
+        output = ET.tostring(root, encoding='utf-8', xml_declaration=False)
 
         # Clean up namespace prefixes that ElementTree adds
-        output = output.replace('ns0:', '').replace(':ns0', '')
-        output = re.sub(r'\s+xmlns:ns\d+="[^"]*"', '', output)
+        output = output.replace(b'ns0:', b'').replace(b':ns0', b'')
+        output = _NS_PREFIX_RE.sub(b'', output)
 
         # Ensure proper SVG namespace
-        if 'xmlns=' not in output:
-            output = output.replace('<svg', '<svg xmlns="http://www.w3.org/2000/svg"', 1)
+        if b'xmlns=' not in output:
+            output = output.replace(b'<svg', b'<svg xmlns="http://www.w3.org/2000/svg"', 1)
 
-        # Write back
-        with open(svg_path, 'w', encoding='utf-8') as f:
-            f.write(output)
+        # Nothing to write if serialization reproduced the file exactly
+        if output == original_content:
+            return True, "No changes needed (output identical)"
+
+        # Write back via temp file + rename so an interrupted run never leaves a truncated icon
+        tmp_path = svg_path.with_suffix(svg_path.suffix + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(output)
+            os.replace(tmp_path, svg_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
 
         return True, "Converted successfully"
 
@@ -116,9 +116,11 @@ def create_database(db_path: Path) -> bool:
     """Create an empty project database with schema."""
     try:
         conn = sqlite3.connect(str(db_path))
-        conn.executescript(SCHEMA)
+        # WAL first so the schema is already written through it; the whole schema
+        # goes in one explicit transaction (one sync instead of one per statement)
         conn.execute("PRAGMA journal_mode=WAL")
-        conn.commit()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("BEGIN;\n" + SCHEMA + "COMMIT;\n")
         conn.close()
         return True
     except Exception as e:
@@ -126,6 +128,16 @@ def create_database(db_path: Path) -> bool:
         return False
 
 
+def iter_klh_files(root):
+    """Yield every .klh file under root (directory entries are not re-stat'ed)."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_klh_files(entry.path)
+            elif entry.name.endswith(".klh") and entry.is_file():
+                yield Path(entry.path)
+
+
 def main():
     print("Initializing example project databases...")
     print(f"Examples directory: {EXAMPLES_DIR}")
@@ -136,7 +148,7 @@ def main():
         return 1
 
     # Find all .klh files
-    klh_files = list(EXAMPLES_DIR.rglob("*.klh"))
+    klh_files = list(iter_klh_files(EXAMPLES_DIR))
 
     if not klh_files:
         print("No .klh project files found")
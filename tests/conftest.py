@@ -0,0 +1,17 @@
+"""
+pytest configuration for the kalahari_api Python binding tests.
+
+Adds the build output directories to sys.path once per session so the
+compiled kalahari_api module can be imported by every test module.
+"""
+
+import os
+import sys
+
+_PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# Both are prepended, so a WSL build takes precedence over a native Linux one
+for build_dir in ('build-linux', 'build-linux-wsl'):
+    build_path = os.path.join(_PROJECT_ROOT, build_dir, 'lib', 'python')
+    if os.path.exists(build_path):
+        sys.path.insert(0, build_path)